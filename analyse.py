@@ -1,19 +1,16 @@
-from googleapiclient.discovery import build
+# Note: importing google_api_tools configures its 'google_api_tools' logger, which
+# starts the shared log listener thread and creates study_buddy.log.
+from google_api_tools import DOC_TEXT_FIELDS, extract_text_from_doc, get_docs_service
 # You would need to load your credentials here using `google-auth-oauthlib`
 
 def get_document_text(doc_id, credentials):
     """Extracts all text from a Google Doc using the Docs API."""
     try:
-        service = build('docs', 'v1', credentials=credentials)
-        document = service.documents().get(documentId=doc_id).execute()
+        service = get_docs_service(credentials)
+        document = service.documents().get(documentId=doc_id, fields=DOC_TEXT_FIELDS).execute()
 
-        # Simplified logic to combine all text from paragraphs
-        text_content = ""
-        for element in document.get('body').get('content'):
-            if 'paragraph' in element:
-                for elem in element.get('paragraph').get('elements'):
-                    if 'textRun' in elem:
-                        text_content += elem.get('textRun').get('content')
+        # Combine all text from paragraphs (joined once rather than concatenated per run)
+        text_content = extract_text_from_doc(document)
 
         return text_content
     except Exception as e:
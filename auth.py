@@ -2,6 +2,11 @@ import json
 import os
 from typing import Optional
 
+try:
+    import orjson
+except ImportError:  # optional speed-up; fall back to the stdlib parser
+    orjson = None
+
 from log_config import setup_logger
 
 logger = setup_logger('auth')
@@ -41,7 +46,7 @@ def authorize() -> Optional[object]:
         creds = None
         if os.path.exists(TOKEN_PATH):
             try:
-                creds = Credentials.from_authorized_user_file(TOKEN_PATH, SCOPES)
+                creds = Credentials.from_authorized_user_info(_read_token(), SCOPES)
                 logger.info("Loaded credentials from %s.", TOKEN_PATH)
             except Exception:
                 logger.warning("Failed to load credentials from %s; will attempt refresh or new flow.", TOKEN_PATH)
@@ -74,11 +79,18 @@ def authorize() -> Optional[object]:
         return _write_placeholder_token()
 
 
+def _read_token() -> dict:
+    """Read `token.json` with a single open and parse it from the raw bytes."""
+    with open(TOKEN_PATH, "rb") as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
 def _write_placeholder_token() -> dict:
     token = {"access_token": "placeholder", "created": True}
     try:
-        with open(TOKEN_PATH, "w", encoding="utf-8") as f:
-            json.dump(token, f, indent=2)
+        with open(TOKEN_PATH, "wb") as f:
+            f.write(orjson.dumps(token) if orjson is not None else json.dumps(token).encode("utf-8"))
         logger.info("Created placeholder credentials and saved to %s.", TOKEN_PATH)
     except Exception:
         logger.warning("Could not write placeholder %s.", TOKEN_PATH)
@@ -1,10 +1,31 @@
-import json
-from typing import List, Dict
+import re
+from itertools import islice
+from typing import List, Dict, Optional
 
 from log_config import setup_logger
 
 logger = setup_logger('gemini_processor')
 
+# A sentence is any run of text between periods; newlines inside it are kept
+# (and, for flashcards, normalised to spaces only for the sentences actually used).
+_SENT_RE = re.compile(r'[^.]+')
+_LEADING_WS_RE = re.compile(r'\s*')
+
+
+def split_sentences(text: str, n: Optional[int] = None, join_lines: bool = True) -> List[str]:
+    """Return up to `n` (default: all) non-empty sentences of `text`.
+
+    Each fragment is stripped once and scanning stops as soon as `n` sentences
+    have been found. Newlines inside a sentence become spaces unless
+    `join_lines` is False, in which case sentences keep their original text.
+    """
+    stripped = (m.group().strip() for m in _SENT_RE.finditer(text))
+    limit = None if n is None else max(n, 0)
+    sentences = islice(filter(None, stripped), limit)
+    if not join_lines:
+        return list(sentences)
+    return [s.replace('\n', ' ') for s in sentences]
+
 
 def summarize_notes(text: str, max_chars: int = 400) -> str:
     """Produce a short summary of `text`.
@@ -20,13 +41,18 @@ def summarize_notes(text: str, max_chars: int = 400) -> str:
             return ""
 
         # Naive summarization: return first N characters up to the last sentence boundary.
-        summary = text.strip()
-        if len(summary) > max_chars:
-            summary = summary[:max_chars]
+        # Work on indices into `text` so only the final summary is copied.
+        start = _LEADING_WS_RE.match(text).end()
+        stop = len(text)
+        while stop > start and text[stop - 1].isspace():
+            stop -= 1
+        if stop - start > max_chars:
+            stop = start + max_chars
             # cut to last full sentence if possible
-            last_period = summary.rfind('. ')
+            last_period = text.rfind('. ', start, stop)
             if last_period != -1:
-                summary = summary[: last_period + 1]
+                stop = last_period + 1
+        summary = text[start:stop]
 
         logger.info("Summary successfully generated. Characters: %d", len(summary))
         return summary
@@ -36,41 +62,36 @@ def summarize_notes(text: str, max_chars: int = 400) -> str:
         raise
 
 
-def generate_flashcards(text: str, n: int = 10) -> List[Dict]:
+def generate_flashcards(text: str, n: int = 10) -> Dict[str, List[str]]:
     """Generate up to `n` flashcards from the input text.
 
-    This function returns a list of dicts: {"question": ..., "answer": ...}.
-    It logs request/response sizes and warns if parsing the generated JSON fails.
+    The deck is returned column-wise as {"questions": [...], "answers": [...]};
+    use `flashcard_records` where one dict per card is needed.
+    It logs request/response sizes.
     """
     logger.info("Requesting %d flashcards from Gemini output generation.", n)
     try:
         if not text:
-            logger.info("Empty input provided to generate_flashcards; returning empty list.")
-            return []
+            logger.info("Empty input provided to generate_flashcards; returning empty deck.")
+            return {"questions": [], "answers": []}
 
         # Simple deterministic approach: split into sentences and make Q/A pairs.
-        sentences = [s.strip() for s in text.replace('\n', ' ').split('.') if s.strip()]
-        flashcards = []
-        for i in range(min(n, len(sentences))):
-            q = f"Explain: {sentences[i][:60].strip()}?"
-            a = sentences[i]
-            flashcards.append({"question": q, "answer": a})
-
-        # Export to JSON string and parse back to demonstrate parsing step.
-        try:
-            json_str = json.dumps(flashcards)
-            parsed = json.loads(json_str)
-            logger.info("Parsed %d flashcards from JSON output.", len(parsed))
-            return parsed
-        except json.JSONDecodeError:
-            logger.warning("Failed to parse JSON output from model — possible hallucination in format.")
-            return flashcards
+        answers = split_sentences(text, n)
+        questions = [f"Explain: {a[:60].strip()}?" for a in answers]
+
+        logger.info("Generated %d flashcards.", len(questions))
+        return {"questions": questions, "answers": answers}
 
     except Exception as e:
         logger.error("Flashcard generation failed: %s", e, exc_info=True)
         raise
 
 
+def flashcard_records(deck: Dict[str, List[str]]) -> List[Dict[str, str]]:
+    """Return a column-wise deck as a list of {"question": ..., "answer": ...} dicts."""
+    return [{"question": q, "answer": a} for q, a in zip(deck["questions"], deck["answers"])]
+
+
 if __name__ == "__main__":
     s = "This is a sample note. It has multiple sentences. Each sentence can become a flashcard."
     print(summarize_notes(s))
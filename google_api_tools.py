@@ -1,35 +1,92 @@
 
 import json
+import mmap
 import os
 import time
+import weakref
 from typing import List, Dict, Optional
 
+try:
+    import orjson
+except ImportError:  # optional speed-up; fall back to the stdlib encoder
+    orjson = None
+
 from log_config import setup_logger
 
 logger = setup_logger('google_api_tools')
 
+# The Google API batch endpoint accepts at most 100 calls per request.
+_BATCH_LIMIT = 100
+
+# Partial-response mask: only the text runs read by `extract_text_from_doc` are returned.
+DOC_TEXT_FIELDS = "body(content(paragraph(elements(textRun(content)))))"
+
+# Docs API services already built, keyed by the credentials object they use.
+# Entries disappear together with their credentials.
+_docs_services: "weakref.WeakKeyDictionary[object, object]" = weakref.WeakKeyDictionary()
+
+
+def get_docs_service(creds: object):
+    """Return a Google Docs API service for `creds`, building it once per credentials object.
+
+    The discovery document bundled with `googleapiclient` is used, so building
+    never needs an HTTP fetch. Raises ImportError if `googleapiclient` is missing.
+    """
+    try:
+        return _docs_services[creds]
+    except (KeyError, TypeError):
+        pass
+
+    from googleapiclient.discovery import build
+
+    service = build('docs', 'v1', credentials=creds, cache_discovery=False, static_discovery=True)
+    try:
+        _docs_services[creds] = service
+    except TypeError:
+        # credentials type that cannot be weakly referenced; skip caching
+        pass
+    return service
+
 
-def _extract_text_from_doc(document: Dict) -> str:
+def extract_text_from_doc(document: Dict) -> str:
     """Extract plain text from the Google Docs document resource.
 
     This implementation walks the document's body content and concatenates
     textRun contents. It is defensive against missing fields.
     """
-    pieces = []
-    body = document.get("body", {})
-    content = body.get("content", [])
-    for c in content:
+    pieces: List[str] = []
+    append = pieces.append
+    for c in document.get("body", {}).get("content", ()):
         paragraph = c.get("paragraph")
         if not paragraph:
             continue
-        elements = paragraph.get("elements", [])
-        for el in elements:
-            tr = el.get("textRun")
-            if tr and "content" in tr:
-                pieces.append(tr["content"])
+        for el in paragraph.get("elements", ()):
+            try:
+                append(el["textRun"]["content"])
+            except (KeyError, TypeError):
+                # element without a textRun (e.g. inline object) or an empty textRun
+                continue
     return "".join(pieces)
 
 
+def _read_local_text(path: str) -> str:
+    """Decode a local UTF-8 file through a read-only memory map.
+
+    The text is decoded straight from the mapped pages, so no intermediate
+    bytes buffer is allocated.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # mmap cannot map an empty file
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            text = str(mm, "utf-8")
+    # match the universal-newlines translation of a text-mode read
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
 def get_document_text(document_id: str, creds: Optional[object] = None) -> str:
     """Fetch document text by ID.
 
@@ -37,6 +94,7 @@ def get_document_text(document_id: str, creds: Optional[object] = None) -> str:
     - If `creds` is provided and `googleapiclient` is available, attempt to fetch
       the document via the Google Docs API.
     - Otherwise, if `document_id` is a path to a local file, return its contents.
+      The file is decoded through a memory map.
     - If both approaches fail, raise FileNotFoundError.
     """
     logger.info("Starting fetch for document ID: %s", document_id)
@@ -45,16 +103,14 @@ def get_document_text(document_id: str, creds: Optional[object] = None) -> str:
     if creds is not None and not isinstance(creds, dict):
         try:
             try:
-                from googleapiclient.discovery import build
-                from googleapiclient.errors import HttpError
-            except Exception:
+                service = get_docs_service(creds)
+            except ImportError:
                 logger.warning("googleapiclient not installed; cannot call Google Docs API.")
                 raise
 
-            service = build('docs', 'v1', credentials=creds)
             logger.info("Attempting to fetch document via Google Docs API: %s", document_id)
-            doc = service.documents().get(documentId=document_id).execute()
-            text = _extract_text_from_doc(doc)
+            doc = service.documents().get(documentId=document_id, fields=DOC_TEXT_FIELDS).execute()
+            text = extract_text_from_doc(doc)
             logger.info("Text extraction complete (Docs API). Characters: %d", len(text))
             return text
         except Exception as e:
@@ -66,8 +122,7 @@ def get_document_text(document_id: str, creds: Optional[object] = None) -> str:
     # Next, try local file fallback
     try:
         if os.path.exists(document_id) and os.path.isfile(document_id):
-            with open(document_id, "r", encoding="utf-8") as f:
-                text = f.read()
+            text = _read_local_text(document_id)
             logger.info("Text extraction complete (local file). Characters: %d", len(text))
             return text
 
@@ -79,19 +134,81 @@ def get_document_text(document_id: str, creds: Optional[object] = None) -> str:
         raise
 
 
-def create_flashcard_deck(flashcards: List[Dict]) -> Dict:
+def get_documents_text(document_ids: List[str], creds: Optional[object] = None) -> Dict[str, str]:
+    """Fetch the text of several documents, keyed by document ID.
+
+    Behavior:
+    - If `creds` is a real credentials object and `googleapiclient` is available,
+      the Docs API requests are sent as batch requests (up to `_BATCH_LIMIT`
+      documents per HTTP round-trip instead of one round-trip per document).
+    - IDs the API did not return are retried through the local-file fallback of
+      `get_document_text`.
+    - Documents that cannot be fetched either way are logged and left out of the result.
+    """
+    unique_ids = list(dict.fromkeys(document_ids))
+    logger.info("Starting batched fetch for %d documents.", len(unique_ids))
+    results: Dict[str, str] = {}
+
+    if unique_ids and creds is not None and not isinstance(creds, dict):
+        try:
+            try:
+                service = get_docs_service(creds)
+            except ImportError:
+                logger.warning("googleapiclient not installed; cannot call Google Docs API.")
+                raise
+
+            def on_response(request_id, response, exception):
+                if exception is not None:
+                    logger.error("Google Docs API error for %s: %s", request_id, exception)
+                    return
+                results[request_id] = extract_text_from_doc(response)
+
+            for start in range(0, len(unique_ids), _BATCH_LIMIT):
+                chunk = unique_ids[start:start + _BATCH_LIMIT]
+                batch = service.new_batch_http_request(callback=on_response)
+                for doc_id in chunk:
+                    batch.add(service.documents().get(documentId=doc_id, fields=DOC_TEXT_FIELDS), request_id=doc_id)
+                logger.info("Attempting to fetch %d documents via a Google Docs API batch.", len(chunk))
+                batch.execute()
+            logger.info("Text extraction complete (Docs API batch). Documents: %d", len(results))
+        except Exception as e:
+            logger.error("Google Docs API batch fetch failed: %s", e, exc_info=True)
+
+    for doc_id in unique_ids:
+        if doc_id in results:
+            continue
+        try:
+            results[doc_id] = get_document_text(doc_id)
+        except Exception:
+            # get_document_text has already logged the failure
+            continue
+
+    return results
+
+
+def create_flashcard_deck(flashcards: Dict[str, List[str]]) -> Dict:
     """Create a simple local 'presentation' representation for flashcards.
 
+    `flashcards` is a column-wise deck ({"questions": [...], "answers": [...]}).
     This function writes a JSON file containing the flashcards and returns a dict
     with a generated id and file URL. Replace with Google Slides API calls when ready.
     """
-    logger.info("Beginning Slides creation for %d flashcards.", len(flashcards))
+    logger.info("Beginning Slides creation for %d flashcards.", len(flashcards["questions"]))
     try:
         ts = int(time.time())
+        # several documents can be processed within the same second; don't overwrite their decks
+        while os.path.exists(f"presentation_{ts}.json"):
+            ts += 1
         filename = f"presentation_{ts}.json"
-        payload = {"id": str(ts), "slides": flashcards}
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(payload, f, indent=2)
+        payload = {"id": str(ts), "questions": flashcards["questions"], "answers": flashcards["answers"]}
+        # compact output: the deck file is machine-read, and indent=2 would push the
+        # stdlib encoder off its C fast path
+        if orjson is not None:
+            data = orjson.dumps(payload)
+        else:
+            data = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        with open(filename, "wb") as f:
+            f.write(data)
 
         presentation_info = {"id": payload["id"], "url": os.path.abspath(filename)}
         logger.info("Created presentation: id=%s url=%s", presentation_info["id"], presentation_info["url"])
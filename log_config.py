@@ -1,13 +1,51 @@
+import atexit
+import functools
 import logging
+import queue
 from logging import Logger
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
 LOG_FILE = "study_buddy.log"
 
+# Records are enqueued by the calling thread and written by a single background
+# listener, so logging in hot loops never blocks on file I/O.
+_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+_listener: Optional[QueueListener] = None
 
+_FMT = logging.Formatter(
+    "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
+)
+
+
+def _start_listener() -> None:
+    """Create the file/stderr handlers and start the background listener once."""
+    global _listener
+    if _listener is not None:
+        return
+
+    fh = logging.FileHandler(LOG_FILE)
+    fh.setLevel(logging.INFO)
+    fh.setFormatter(_FMT)
+
+    # Also ensure exceptions are visible on stderr during development
+    sh = logging.StreamHandler()
+    sh.setLevel(logging.ERROR)
+    sh.setFormatter(_FMT)
+
+    _listener = QueueListener(_queue, fh, sh, respect_handler_level=True)
+    _listener.start()
+    # flush any queued records before the interpreter exits
+    atexit.register(_listener.stop)
+
+
+@functools.lru_cache(maxsize=None)
 def setup_logger(name: Optional[str] = None) -> Logger:
     """Configure and return a logger writing to `study_buddy.log`.
 
+    The logger only gets a `QueueHandler`; the actual file and stderr handlers
+    live on a shared background `QueueListener`. Results are cached per name,
+    so repeated calls return the already-configured logger without any work.
     If the logger already has handlers, do not add another handler (prevents duplicates).
     """
     logger_name = name or __name__
@@ -17,20 +55,9 @@ def setup_logger(name: Optional[str] = None) -> Logger:
     if logger.handlers:
         return logger
 
-    formatter = logging.Formatter(
-        "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
-    )
-
-    fh = logging.FileHandler(LOG_FILE)
-    fh.setLevel(logging.INFO)
-    fh.setFormatter(formatter)
-
-    logger.addHandler(fh)
-
-    # Also ensure exceptions are visible on stderr during development
-    sh = logging.StreamHandler()
-    sh.setLevel(logging.ERROR)
-    sh.setFormatter(formatter)
-    logger.addHandler(sh)
+    _start_listener()
+    logger.addHandler(QueueHandler(_queue))
+    # the listener already emits every record; don't repeat it through the root logger
+    logger.propagate = False
 
     return logger
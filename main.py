@@ -1,40 +1,56 @@
 import sys
 import os
+import re
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from jinja2 import Environment, FileSystemLoader
 from log_config import setup_logger
 
 from auth import authorize
-from google_api_tools import get_document_text, create_flashcard_deck
-from gemini_processor import summarize_notes, generate_flashcards
+from google_api_tools import get_document_text, get_documents_text, create_flashcard_deck
+from gemini_processor import summarize_notes, generate_flashcards, flashcard_records, split_sentences
 from templates import instantiate, render_markdown, save_markdown, save_json
 from datetime import date
 
 logger = setup_logger('main')
 
+# Upper bound on concurrent generate_flashcards calls per document.
+_FLASHCARD_WORKERS = 8
 
-def main(doc_id: str | None = None):
+
+def main(doc_ids: list[str] | str | None = None, creds=None):
+    """Run the Study Buddy workflow for one or more documents.
+
+    `doc_ids` may be a single document ID (or local path), a list of them, or
+    None to use the local sample. A single ID or None returns that document's
+    presentation info; a list returns one entry per document fetched.
+    """
     logger.info("Study Buddy workflow initiated.")
+    single = doc_ids is None or isinstance(doc_ids, str)
+    if isinstance(doc_ids, str):
+        doc_ids = [doc_ids]
     try:
-        creds = authorize()
+        if creds is None:
+            creds = authorize()
         if creds:
             logger.info("Authorization completed.")
         else:
             logger.info("Proceeding without valid credentials (using local fallbacks).")
 
-        # Determine document source
-        text = ""
-        if doc_id:
-            try:
-                # pass credentials to allow API retrieval when possible
-                text = get_document_text(doc_id, creds=creds)
-                logger.info("Notes successfully fetched from document: %s", doc_id)
-            except FileNotFoundError:
-                logger.error("Document %s not found locally and API fetch failed.", doc_id)
-                raise
-            except Exception:
-                logger.error("Unable to fetch notes for document_id=%s; aborting document step.", doc_id)
-                raise
+        # Determine document sources; all requested documents are fetched up front
+        # so the Docs API calls can go out as a single batch.
+        documents: list[tuple[str | None, str]] = []
+        if doc_ids:
+            # pass credentials to allow API retrieval when possible
+            texts = get_documents_text(doc_ids, creds=creds)
+            for doc_id in doc_ids:
+                if doc_id in texts:
+                    documents.append((doc_id, texts[doc_id]))
+                    logger.info("Notes successfully fetched from document: %s", doc_id)
+                else:
+                    logger.error("Document %s not found locally and API fetch failed.", doc_id)
+            if not documents:
+                raise FileNotFoundError(f"None of the documents {doc_ids} could be fetched.")
         else:
             # Try a local default file first
             try:
@@ -43,56 +59,90 @@ def main(doc_id: str | None = None):
             except Exception:
                 logger.warning("No document provided and no local sample found; using placeholder notes.")
                 text = "Placeholder notes: no document provided. Add a text file or pass a document id."
+            documents.append((None, text))
+
+        # one date stamp for every output file of this run
+        today = date.today().isoformat()
+        presentations = [process_document(doc_id, text, today) for doc_id, text in documents]
+
+        logger.info("Study Buddy process complete. Check the log file for details.")
+        return presentations[0] if single else presentations
+
+    except Exception as e:
+        logger.critical("Study Buddy script crashed: %s", e, exc_info=True)
+        raise
 
-        # Summarize notes
-        summary = summarize_notes(text)
-        logger.info("Notes summarization complete.")
 
-        # Prepare container for highlight-created flashcards
-        highlight_cards = []
+def server():
+    """Run as a long-lived worker that processes document IDs read from stdin, one per line.
 
-        # Populate and save a document summary using templates
+    Imports and authorization happen once, and the Docs API service is reused
+    across jobs, so each document only pays for its own work.
+    """
+    logger.info("Study Buddy worker started; reading document IDs from stdin.")
+    creds = authorize()
+    for line in sys.stdin:
+        doc_id = line.strip()
+        if not doc_id:
+            continue
         try:
-            doc_title = doc_id if doc_id else "local_sample"
-            doc_summary = instantiate("document_summary", {
-                "document_title": doc_title,
-                "overview": summary,
-                # simple heuristic: use first 3 sentences as key highlights
-                "key_highlights": [s.strip() for s in summary.split('.') if s.strip()][:3],
-                "important_terms": [],
-                "action_items": [],
-            })
-
-            md = render_markdown("document_summary", doc_summary)
-            md_fname = f"document_summary_{doc_title}_{date.today().isoformat()}.md"
-            json_fname = f"document_summary_{doc_title}_{date.today().isoformat()}.json"
-            save_markdown(md_fname, md)
-            save_json(json_fname, doc_summary)
-            logger.info("Saved document summary: %s and %s", md_fname, json_fname)
-
-            # Create flashcards directly from highlights
-            highlights = doc_summary.get("key_highlights", [])
-            for i, h in enumerate(highlights, start=1):
-                try:
-                    # Attempt to generate a better-formulated flashcard from the highlight
-                    generated = generate_flashcards(h, n=1)
-                    if generated and isinstance(generated, list) and len(generated) > 0:
-                        # Merge generated flashcard into the flashcard template to ensure fields
-                        card = instantiate("flashcard", generated[0])
-                    else:
-                        # Fallback simple phrasing
-                        q = f"Explain: {h[:60].strip()}?"
-                        a = h
-                        card = instantiate("flashcard", {
-                            "question": q,
-                            "answer": a,
-                            "hint": "Review the document highlights",
-                            "difficulty": "Medium",
-                            "next_review_date": "",
-                        })
-                    highlight_cards.append(card)
-                except Exception:
-                    logger.warning("generate_flashcards failed for highlight #%d; using fallback card.", i, exc_info=True)
+            main([doc_id], creds=creds)
+        except Exception:
+            # main() has already logged the failure; keep serving the next job
+            continue
+    logger.info("Study Buddy worker stopped (stdin closed).")
+
+
+def process_document(doc_id: str | None, text: str, today: str | None = None):
+    """Summarize one document's notes, build its flashcards and write the outputs.
+
+    `today` is the ISO date used in output filenames (defaults to the current date).
+    """
+    if today is None:
+        today = date.today().isoformat()
+    # Summarize notes
+    summary = summarize_notes(text)
+    logger.info("Notes summarization complete.")
+
+    # Prepare container for highlight-created flashcards
+    highlight_cards = []
+
+    # Populate and save a document summary using templates
+    try:
+        doc_title = doc_id if doc_id else "local_sample"
+        doc_summary = instantiate("document_summary", {
+            "document_title": doc_title,
+            "overview": summary,
+            # simple heuristic: use first 3 sentences as key highlights
+            "key_highlights": split_sentences(summary, 3, join_lines=False),
+            "important_terms": [],
+            "action_items": [],
+        })
+
+        md = render_markdown("document_summary", doc_summary)
+        md_fname = f"document_summary_{doc_title}_{today}.md"
+        json_fname = f"document_summary_{doc_title}_{today}.json"
+        save_markdown(md_fname, md)
+        save_json(json_fname, doc_summary)
+        logger.info("Saved document summary: %s and %s", md_fname, json_fname)
+
+        # Create flashcards directly from highlights
+        highlights = doc_summary.get("key_highlights", [])
+        # Attempt to generate a better-formulated flashcard from each highlight; the
+        # calls are independent, so run them concurrently and collect them in order.
+        with ThreadPoolExecutor(max_workers=_FLASHCARD_WORKERS) as executor:
+            futures = [executor.submit(generate_flashcards, h, 1) for h in highlights]
+        for i, (h, future) in enumerate(zip(highlights, futures), start=1):
+            try:
+                generated = future.result()
+                if generated["questions"]:
+                    # Merge generated flashcard into the flashcard template to ensure fields
+                    card = instantiate("flashcard", {
+                        "question": generated["questions"][0],
+                        "answer": generated["answers"][0],
+                    })
+                else:
+                    # Fallback simple phrasing
                     q = f"Explain: {h[:60].strip()}?"
                     a = h
                     card = instantiate("flashcard", {
@@ -102,41 +152,61 @@ def main(doc_id: str | None = None):
                         "difficulty": "Medium",
                         "next_review_date": "",
                     })
-                    highlight_cards.append(card)
-
-            if highlight_cards:
-                highlights_fname = f"flashcards_from_highlights_{doc_title}_{date.today().isoformat()}.json"
-                save_json(highlights_fname, highlight_cards)
-                logger.info("Saved %d highlight-derived flashcards to %s", len(highlight_cards), highlights_fname)
-
-        except Exception as e:
-            logger.error("Failed to create/save document summary: %s", e, exc_info=True)
+                highlight_cards.append(card)
+            except Exception:
+                logger.warning("generate_flashcards failed for highlight #%d; using fallback card.", i, exc_info=True)
+                q = f"Explain: {h[:60].strip()}?"
+                a = h
+                card = instantiate("flashcard", {
+                    "question": q,
+                    "answer": a,
+                    "hint": "Review the document highlights",
+                    "difficulty": "Medium",
+                    "next_review_date": "",
+                })
+                highlight_cards.append(card)
+
+        if highlight_cards:
+            highlights_fname = f"flashcards_from_highlights_{doc_title}_{today}.json"
+            save_json(highlights_fname, highlight_cards)
+            logger.info("Saved %d highlight-derived flashcards to %s", len(highlight_cards), highlights_fname)
 
-        # Generate flashcards (LLM/deterministic) and combine with highlight-derived cards
-        generated_cards = generate_flashcards(summary, n=10)
-        # combine: give precedence to highlight-derived cards first
-        final_flashcards = highlight_cards + generated_cards
-        logger.info("Generated %d flashcards (including %d from highlights).", len(final_flashcards), len(highlight_cards))
+    except Exception as e:
+        logger.error("Failed to create/save document summary: %s", e, exc_info=True)
 
-        # Create a simple presentation locally
-        presentation = create_flashcard_deck(final_flashcards)
-        logger.info("Presentation created: %s", presentation.get("url"))
+    # Generate flashcards (LLM/deterministic) and combine with highlight-derived cards
+    generated_cards = generate_flashcards(summary, n=10)
+    # combine: give precedence to highlight-derived cards first
+    final_flashcards = {
+        "questions": [c["question"] for c in highlight_cards] + generated_cards["questions"],
+        "answers": [c["answer"] for c in highlight_cards] + generated_cards["answers"],
+    }
+    logger.info("Generated %d flashcards (including %d from highlights).", len(final_flashcards["questions"]), len(highlight_cards))
 
-        logger.info("Generating HTML report...")
-        generate_html_report(doc_summary, final_flashcards)
+    # Create a simple presentation locally
+    presentation = create_flashcard_deck(final_flashcards)
+    logger.info("Presentation created: %s", presentation.get("url"))
 
-        logger.info("Study Buddy process complete. Check the log file for details.")
-        return presentation
+    logger.info("Generating HTML report...")
+    generate_html_report(doc_summary, flashcard_records(final_flashcards))
 
-    except Exception as e:
-        logger.critical("Study Buddy script crashed: %s", e, exc_info=True)
-        raise
+    return presentation
 
 
 def generate_html_report(summary, flashcards):
-    """Generates an HTML report from the summary and flashcards."""
-    # Create output directory if it doesn't exist
-    output_dir = "report"
+    """Generates an HTML report from the summary and flashcards.
+
+    Each document gets its own `report/<document title>/` directory, so reports
+    for several documents in one run (or in worker mode) don't overwrite each other.
+    """
+    # Create output directory if it doesn't exist; anything but word characters,
+    # dots and dashes is replaced so the title can't escape report/ (e.g. via
+    # path separators or a Windows drive prefix)
+    doc_dir = re.sub(r"[^\w.-]", "_", summary["document_title"])
+    if not doc_dir.strip("."):
+        # "", "." and ".." would not name a subdirectory
+        doc_dir = "_"
+    output_dir = os.path.join("report", doc_dir)
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
@@ -168,5 +238,7 @@ def generate_html_report(summary, flashcards):
 
 
 if __name__ == "__main__":
-    arg = sys.argv[1] if len(sys.argv) > 1 else None
-    main(arg)
+    if sys.argv[1:] == ["--serve"]:
+        server()
+    else:
+        main(sys.argv[1:])
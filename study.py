@@ -1,5 +1,7 @@
+import functools
 import google.genai as genai
 import os
+from concurrent.futures import ThreadPoolExecutor
 from google.genai import types
 from dotenv import load_dotenv
 
@@ -9,26 +11,74 @@ load_dotenv()
 API_KEY = os.getenv("GOOGLE_API_KEY")
 client = genai.Client()
 
+# 2. Define the Prompt
+# A clear, specific prompt is key to a good summary. The instructions never change,
+# so they live in one module-level config as the system instruction and each
+# request's contents are just the notes.
+SYSTEM_PROMPT = (
+    "You are an expert study buddy. Summarize the following study notes. "
+    "The summary must be 5 concise bullet points covering the key topics and definitions."
+)
+SUMMARY_CONFIG = types.GenerateContentConfig(system_instruction=SYSTEM_PROMPT)
+
+# Long notes are summarized piece by piece (in parallel) and the partial summaries
+# are then fused into the final 5 bullet points, so no single prompt grows with the
+# whole document.
+CHUNK_CHARS = 8000
+CHUNK_WORKERS = 4
+CHUNK_PROMPT = (
+    "You are an expert study buddy. Summarize this excerpt from a longer set of study notes, "
+    "keeping every key topic and definition it mentions."
+)
+CHUNK_CONFIG = types.GenerateContentConfig(system_instruction=CHUNK_PROMPT)
+
+def _split_chunks(text: str, size: int) -> list[str]:
+    """Splits text into pieces of at most `size` characters without rewriting it.
+
+    Cuts prefer a paragraph break, then a line break, then any whitespace, so
+    bullets, headings and paragraphs reach the model as written.
+    """
+    chunks = []
+    start = 0
+    while len(text) - start > size:
+        end = start + size
+        cut = text.rfind("\n\n", start, end)
+        if cut <= start:
+            cut = text.rfind("\n", start, end)
+        if cut <= start:
+            cut = max(text.rfind(" ", start, end), text.rfind("\t", start, end))
+        if cut <= start:
+            cut = end
+        chunks.append(text[start:cut])
+        start = cut
+    chunks.append(text[start:])
+    return [chunk for chunk in chunks if chunk.strip()]
+
+@functools.lru_cache(maxsize=256)
+def _summarize_chunk(chunk: str) -> str:
+    """Summarizes one excerpt; cached so re-processed notes don't re-send unchanged chunks."""
+    response = client.models.generate_content(
+        model='gemini-2.5-flash',
+        contents=chunk,
+        config=CHUNK_CONFIG,
+    )
+    return response.text
+
 def summarize_notes(notes_text: str):
     """Generates a concise summary from a block of text using the Gemini API."""
-    
-    # 2. Define the Prompt
-    # A clear, specific prompt is key to a good summary.
-    prompt = f"""
-    You are an expert study buddy. Summarize the following study notes. 
-    The summary must be 5 concise bullet points covering the key topics and definitions.
-    
-    --- NOTES ---
-    {notes_text}
-    ---
-    """
-    
+
     # 3. Call the Gemini API
     # Using 'gemini-2.5-flash' for fast and high-quality text tasks.
     try:
+        if len(notes_text) > CHUNK_CHARS:
+            chunks = _split_chunks(notes_text, CHUNK_CHARS)
+            with ThreadPoolExecutor(max_workers=CHUNK_WORKERS) as executor:
+                notes_text = "\n\n".join(executor.map(_summarize_chunk, chunks))
+
         response = client.models.generate_content(
             model='gemini-2.5-flash',
-            contents=prompt
+            contents=notes_text,
+            config=SUMMARY_CONFIG,
         )
         return response.text
     except Exception as e:
@@ -1,6 +1,13 @@
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Mapping, Tuple
 import json
+import os
 from datetime import date
+from types import MappingProxyType
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; fall back to the stdlib encoder
+    orjson = None
 
 """Templates module
 
@@ -73,16 +80,50 @@ TEMPLATES: Dict[str, Dict[str, Any]] = {
 }
 
 
+def _build_cloner(name: str, base: Dict[str, Any]) -> Callable[[], Dict[str, Any]]:
+    """Compile a function that returns a fresh copy of `base` built from literals.
+
+    Template defaults are plain JSON-style values, so their repr is valid Python
+    source; every call re-evaluates the literal and yields new nested lists/dicts.
+    """
+    namespace: Dict[str, Any] = {}
+    exec(f"def _clone_{name}():\n    return {base!r}\n", namespace)
+    return namespace[f"_clone_{name}"]
+
+
+# One cloner per template, generated from TEMPLATES at import time.
+_CLONERS: Dict[str, Callable[[], Dict[str, Any]]] = {
+    name: _build_cloner(name, base) for name, base in TEMPLATES.items()
+}
+
+
 def get_template(name: str) -> Dict[str, Any]:
-    """Return a deep-ish copy of the template structure for `name`.
+    """Return a deep copy of the template structure for `name`.
 
     Caller may modify the returned dict without altering the canonical template.
     """
-    base = TEMPLATES.get(name)
-    if base is None:
+    cloner = _CLONERS.get(name)
+    if cloner is None:
         raise KeyError(f"Unknown template: {name}")
-    # shallow copy is sufficient because nested lists/dicts are intentionally simple
-    return json.loads(json.dumps(base))
+    return cloner()
+
+
+# Read-only views of the canonical templates for callers that only read fields.
+_TEMPLATE_VIEWS: Dict[str, Mapping[str, Any]] = {
+    name: MappingProxyType(base) for name, base in TEMPLATES.items()
+}
+
+
+def get_template_view(name: str) -> Mapping[str, Any]:
+    """Return a read-only view of the template for `name` without copying it.
+
+    Nested lists/dicts are shared with `TEMPLATES` and must not be modified;
+    use `get_template` or `instantiate` when a mutable copy is needed.
+    """
+    view = _TEMPLATE_VIEWS.get(name)
+    if view is None:
+        raise KeyError(f"Unknown template: {name}")
+    return view
 
 
 def instantiate(name: str, values: Dict[str, Any] | None = None) -> Dict[str, Any]:
@@ -90,105 +131,204 @@ def instantiate(name: str, values: Dict[str, Any] | None = None) -> Dict[str, An
     tpl = get_template(name)
     if not values:
         return tpl
-    for k, v in values.items():
-        if k in tpl:
-            tpl[k] = v
-        else:
-            # allow adding custom fields
-            tpl[k] = v
+    # known keys override defaults and unknown keys are kept as custom fields,
+    # so a single dict.update covers both
+    tpl.update(values)
     return tpl
 
 
-def render_markdown(name: str, content: Dict[str, Any]) -> str:
-    """Render the filled template as a Markdown string.
+# Field kinds used by the render schema.
+_SCALAR, _LIST, _DICT = 0, 1, 2
 
-    The output is human-readable and structured for quick copying into notes.
+# Render layout per template: (heading, content key, kind) in render order.
+_RENDER_SCHEMA: Dict[str, Tuple[Tuple[str, str, int], ...]] = {
+    "note": (
+        ("Topic / Title", "title", _SCALAR),
+        ("Key Points", "key_points", _LIST),
+        ("Summary", "summary", _SCALAR),
+        ("Definitions", "definitions", _LIST),
+        ("Examples", "examples", _LIST),
+        ("Questions I Still Have", "questions", _LIST),
+    ),
+    "flashcard": (
+        ("Question", "question", _SCALAR),
+        ("Answer", "answer", _SCALAR),
+        ("Hint", "hint", _SCALAR),
+        ("Difficulty", "difficulty", _SCALAR),
+        ("Next Review Date", "next_review_date", _SCALAR),
+    ),
+    "quiz": (
+        ("Question", "question", _SCALAR),
+        ("Options", "options", _LIST),
+        ("Correct Answer", "correct_answer", _SCALAR),
+        ("Explanation", "explanation", _SCALAR),
+    ),
+    "study_plan": (
+        ("Weekly Goals", "weekly_goals", _LIST),
+        ("Subjects", "subjects", _LIST),
+        ("Daily Targets", "daily_targets", _DICT),
+        ("Resources Needed", "resources_needed", _LIST),
+        ("Progress (%)", "progress_percent", _SCALAR),
+        ("Notes", "notes", _SCALAR),
+    ),
+    "document_summary": (
+        ("Document Title", "document_title", _SCALAR),
+        ("Overview", "overview", _SCALAR),
+        ("Key Highlights", "key_highlights", _LIST),
+        ("Important Terms", "important_terms", _LIST),
+        ("Action Items / To-Do", "action_items", _LIST),
+    ),
+    "task": (
+        ("Task", "task", _SCALAR),
+        ("Priority", "priority", _SCALAR),
+        ("Deadline", "deadline", _SCALAR),
+        ("Status", "status", _SCALAR),
+        ("Notes", "notes", _SCALAR),
+    ),
+    "research": (
+        ("Topic", "topic", _SCALAR),
+        ("Objective", "objective", _SCALAR),
+        ("Sources", "sources", _LIST),
+        ("Findings", "findings", _LIST),
+        ("Conclusion", "conclusion", _SCALAR),
+        ("References", "references", _LIST),
+    ),
+}
+
+# Rendered headings, computed once: the "# Title" line per template and the
+# "\n**Heading**\n" line per section. The generated renderers embed them as constants.
+_TITLE_HEADER: Dict[str, str] = {
+    name: "# " + name.replace("_", " ").title() for name in _RENDER_SCHEMA
+}
+_SECTION_HEADER: Dict[str, str] = {
+    label: "\n**" + label + "**\n" for schema in _RENDER_SCHEMA.values() for label, _, _ in schema
+}
+
+
+def _add_body(lines: List[str], body: Any) -> None:
+    """Append a section body of any type (list, dict or scalar) to `lines`."""
+    if isinstance(body, list):
+        if not body:
+            lines.append("- ")
+        lines.extend(["- " + item if item.__class__ is str else "- " + str(item) for item in body])
+    elif isinstance(body, dict):
+        lines.extend([f"- **{subk}**: {subv}" for subk, subv in body.items()])
+    else:
+        lines.append(str(body) if body is not None else "")
+
+
+def _build_renderer(name: str) -> Callable[[Mapping[str, Any]], str]:
+    """Generate a Markdown renderer specialised for template `name`.
+
+    Section order, headings and each field's kind from `_RENDER_SCHEMA` are
+    baked into the generated source; a field holding an unexpected type is
+    rendered through `_add_body` instead.
     """
-    lines: List[str] = []
-    lines.append(f"# {name.replace('_', ' ').title()}")
-
-    def add_section(title: str, body: Any):
-        lines.append(f"\n**{title}**\n")
-        if isinstance(body, list):
-            if not body:
-                lines.append("- ")
-            for item in body:
-                lines.append(f"- {item}")
-        elif isinstance(body, dict):
-            for subk, subv in body.items():
-                lines.append(f"- **{subk}**: {subv}")
+    base = TEMPLATES[name]
+    src = [
+        f"def _render_{name}(content):",
+        "    get = content.get",
+        f"    out = [{_TITLE_HEADER[name]!r}]",
+    ]
+    for label, key, kind in _RENDER_SCHEMA[name]:
+        src.append(f"    out.append({_SECTION_HEADER[label]!r})")
+        src.append(f"    v = get({key!r}, {base[key].__class__()!r})")
+        if kind == _LIST:
+            src += [
+                "    if v.__class__ is list:",
+                "        if v:",
+                "            out.extend(['- ' + item if item.__class__ is str else '- ' + str(item) for item in v])",
+                "        else:",
+                "            out.append('- ')",
+            ]
+        elif kind == _DICT:
+            src += [
+                "    if v.__class__ is dict:",
+                "        out.extend([f'- **{subk}**: {subv}' for subk, subv in v.items()])",
+            ]
         else:
-            lines.append(str(body) if body is not None else "")
-
-    # rendering rules per template
-    if name == "note":
-        add_section("Topic / Title", content.get("title", ""))
-        add_section("Key Points", content.get("key_points", []))
-        add_section("Summary", content.get("summary", ""))
-        add_section("Definitions", content.get("definitions", []))
-        add_section("Examples", content.get("examples", []))
-        add_section("Questions I Still Have", content.get("questions", []))
-
-    elif name == "flashcard":
-        add_section("Question", content.get("question", ""))
-        add_section("Answer", content.get("answer", ""))
-        add_section("Hint", content.get("hint", ""))
-        add_section("Difficulty", content.get("difficulty", ""))
-        add_section("Next Review Date", content.get("next_review_date", ""))
-
-    elif name == "quiz":
-        add_section("Question", content.get("question", ""))
-        add_section("Options", content.get("options", []))
-        add_section("Correct Answer", content.get("correct_answer", ""))
-        add_section("Explanation", content.get("explanation", ""))
-
-    elif name == "study_plan":
-        add_section("Weekly Goals", content.get("weekly_goals", []))
-        add_section("Subjects", content.get("subjects", []))
-        add_section("Daily Targets", content.get("daily_targets", {}))
-        add_section("Resources Needed", content.get("resources_needed", []))
-        add_section("Progress (%)", content.get("progress_percent", 0))
-        add_section("Notes", content.get("notes", ""))
-
-    elif name == "document_summary":
-        add_section("Document Title", content.get("document_title", ""))
-        add_section("Overview", content.get("overview", ""))
-        add_section("Key Highlights", content.get("key_highlights", []))
-        add_section("Important Terms", content.get("important_terms", []))
-        add_section("Action Items / To-Do", content.get("action_items", []))
-
-    elif name == "task":
-        add_section("Task", content.get("task", ""))
-        add_section("Priority", content.get("priority", ""))
-        add_section("Deadline", content.get("deadline", ""))
-        add_section("Status", content.get("status", ""))
-        add_section("Notes", content.get("notes", ""))
-
-    elif name == "research":
-        add_section("Topic", content.get("topic", ""))
-        add_section("Objective", content.get("objective", ""))
-        add_section("Sources", content.get("sources", []))
-        add_section("Findings", content.get("findings", []))
-        add_section("Conclusion", content.get("conclusion", ""))
-        add_section("References", content.get("references", []))
+            src += [
+                "    if v.__class__ is str:",
+                "        out.append(v)",
+            ]
+        src += [
+            "    else:",
+            "        _add_body(out, v)",
+        ]
+    src.append("    return '\\n'.join(out)")
+
+    namespace: Dict[str, Any] = {"_add_body": _add_body}
+    exec("\n".join(src), namespace)
+    return namespace[f"_render_{name}"]
+
+
+# One specialised renderer per template, generated at import time.
+_RENDERERS: Dict[str, Callable[[Mapping[str, Any]], str]] = {
+    name: _build_renderer(name) for name in _RENDER_SCHEMA
+}
 
-    else:
-        # generic dump
-        lines.append("\n``json\n")
-        lines.append(json.dumps(content, indent=2))
-        lines.append("\n```")
 
+def render_markdown(name: str, content: Mapping[str, Any]) -> str:
+    """Render the filled template as a Markdown string.
+
+    The output is human-readable and structured for quick copying into notes.
+    `content` may be a read-only view from `get_template_view`.
+    """
+    renderer = _RENDERERS.get(name)
+    if renderer is not None:
+        return renderer(content)
+
+    # generic dump
+    lines = [f"# {name.replace('_', ' ').title()}"]
+    lines.append("\n``json\n")
+    lines.append(json.dumps(content, indent=2))
+    lines.append("\n```")
     return "\n".join(lines)
 
 
+def _write_bytes(path: str, data: bytes) -> None:
+    """Write `data` to `path` (created or truncated), normally with a single write syscall."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            # os.write may write less than requested; continue with the remainder
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
 def save_markdown(path: str, md: str) -> None:
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(md)
+    _write_bytes(path, md.encode("utf-8"))
+
+
+# datetime/date/time and dataclasses are passed through to `default=str`, as with the
+# stdlib encoder, instead of being serialized natively by orjson.
+_ORJSON_OPTIONS = (
+    orjson.OPT_INDENT_2
+    | orjson.OPT_NON_STR_KEYS
+    | orjson.OPT_PASSTHROUGH_DATETIME
+    | orjson.OPT_PASSTHROUGH_DATACLASS
+) if orjson is not None else 0
 
 
 def save_json(path: str, obj: Any) -> None:
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(obj, f, indent=2, default=str)
+    """Write `obj` as indented JSON, using `str()` for values JSON can't represent.
+
+    With orjson installed the output differs from `json.dump` in a few ways:
+    non-ASCII text is written as UTF-8 instead of `\\u` escapes, NaN/Infinity
+    become `null`, and enums are written as their value.
+    """
+    data = None
+    if orjson is not None:
+        try:
+            data = orjson.dumps(obj, default=str, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # something orjson can't encode (e.g. an int wider than 64 bits); use the stdlib encoder
+            pass
+    if data is None:
+        data = json.dumps(obj, indent=2, default=str).encode("utf-8")
+    _write_bytes(path, data)
 
 
 if __name__ == "__main__":
@@ -198,3 +338,6 @@ if __name__ == "__main__":
     fname = f"note_{date.today().isoformat()}.md"
     save_markdown(fname, md)
     print(f"Wrote {fname}")
+
+    # Blank templates are only read, so render straight from the read-only view
+    print(render_markdown("flashcard", get_template_view("flashcard")))
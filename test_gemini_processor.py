@@ -0,0 +1,14 @@
+from gemini_processor import split_sentences, summarize_notes
+
+
+def test_summarize_notes_skips_leading_whitespace():
+    assert summarize_notes("\t \n\n \r ..", max_chars=1) == "."
+    notes = "\n" * 1600 + "First sentence. Second sentence."
+    assert summarize_notes(notes) == notes.strip()
+
+
+def test_split_sentences_join_lines():
+    text = "First one. Second one\nspans lines. Third. Fourth."
+    baseline = [s.strip() for s in text.split('.') if s.strip()][:3]
+    assert split_sentences(text, 3, join_lines=False) == baseline
+    assert split_sentences(text, 3) == ["First one", "Second one spans lines", "Third"]
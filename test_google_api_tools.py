@@ -0,0 +1,91 @@
+import google_api_tools
+
+
+class FakeBatch:
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.requests = {}
+
+    def add(self, request, request_id):
+        # like googleapiclient's BatchHttpRequest, a repeated request_id is rejected
+        if request_id in self.requests:
+            raise KeyError(f"A request with this ID already exists: {request_id}")
+        self.requests[request_id] = request
+
+    def execute(self):
+        self.service.batch_sizes.append(len(self.requests))
+        for request_id, request in self.requests.items():
+            if request["documentId"] in self.service.failing:
+                self.callback(request_id, None, Exception("HTTP 404"))
+            else:
+                doc = {"body": {"content": [{"paragraph": {"elements": [
+                    {"textRun": {"content": "text of " + request["documentId"]}},
+                ]}}]}}
+                self.callback(request_id, doc, None)
+
+
+class FakeDocuments:
+    def get(self, documentId, fields=None):
+        assert fields == google_api_tools.DOC_TEXT_FIELDS
+        return {"documentId": documentId}
+
+
+class FakeService:
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.batch_sizes = []
+
+    def documents(self):
+        return FakeDocuments()
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+
+def _patch_service(monkeypatch, service):
+    builds = []
+
+    def fake_get_docs_service(creds):
+        builds.append(creds)
+        return service
+
+    monkeypatch.setattr(google_api_tools, "get_docs_service", fake_get_docs_service)
+    return builds
+
+
+def test_get_documents_text_batches_and_dedupes(monkeypatch):
+    service = FakeService()
+    builds = _patch_service(monkeypatch, service)
+    ids = [f"doc{i}" for i in range(206)] + ["doc7"]
+
+    texts = google_api_tools.get_documents_text(ids, creds=object())
+
+    assert len(builds) == 1
+    assert service.batch_sizes == [100, 100, 6]
+    assert len(texts) == 206
+    assert texts["doc7"] == "text of doc7"
+
+
+def test_get_documents_text_falls_back_to_local_files(monkeypatch, tmp_path):
+    local = tmp_path / "notes.txt"
+    local.write_text("local notes", encoding="utf-8")
+    service = FakeService(failing={str(local), "missing"})
+    _patch_service(monkeypatch, service)
+
+    texts = google_api_tools.get_documents_text(["remote", str(local), "missing"], creds=object())
+
+    # API errors are per document: the local file is read, the missing one is left out
+    assert texts == {"remote": "text of remote", str(local): "local notes"}
+
+
+def test_get_documents_text_without_credentials_reads_local_files(monkeypatch, tmp_path):
+    local = tmp_path / "notes.txt"
+    local.write_text("local notes", encoding="utf-8")
+    builds = _patch_service(monkeypatch, FakeService())
+
+    # authorize() returns a placeholder dict when OAuth is not configured
+    texts = google_api_tools.get_documents_text([str(local), "missing"], creds={"access_token": "placeholder"})
+
+    assert builds == []
+    assert texts == {str(local): "local notes"}